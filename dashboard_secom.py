@@ -16,13 +16,24 @@ interface DashboardViewProps {
   onFiltersChange?: (filters: { sheet?: string; tab?: string; category?: string }) => void;
 }
 
+/** Formatador BRL único — toLocaleString com opções recria um Intl.NumberFormat a cada chamada */
+const BRL = new Intl.NumberFormat('pt-BR', { style: 'currency', currency: 'BRL' });
+
 /** Utilitário seguro para BRL */
-const formatCurrency = (value: number) =>
-  (isFinite(value) ? value : 0).toLocaleString('pt-BR', { style: 'currency', currency: 'BRL' });
+const formatCurrency = (value: number) => BRL.format(isFinite(value) ? value : 0);
 
 /** Evita divisões por zero/NaN */
 const pct = (num: number, den: number) => (den > 0 ? (num / den) * 100 : 0);
 
+/** Linha de totalização da planilha (“TOTAL”, “Total Geral”…) — um único toLowerCase por nome */
+const isTotalName = (name?: string) => !!name && name.toLowerCase().includes('total');
+
+/** Formatadores dos gráficos — estáveis entre renders */
+const formatMillions = (v: number) => `R$ ${(Number(v || 0) / 1_000_000).toFixed(1)}M`;
+const formatTooltipValue = (v: number) => formatCurrency(Number(v || 0));
+const renderPieLabel = ({ name, percent }: { name?: string; percent?: number }) =>
+  `${name}: ${((percent || 0) * 100).toFixed(0)}%`;
+
 /** Paleta coerente com CSS vars */
 const COLORS = [
   'hsl(var(--primary))',
@@ -33,13 +44,30 @@ const COLORS = [
   'hsl(var(--secondary))'
 ];
 
+/** Lista fixa do bloco “Totalizadores por Valor Global” (chave já normalizada) */
+const TOTALIZER_NAMES = [
+  'OAM', 'TVs', 'Site', 'Rádio', 'Jornais/Revistas',
+  'Criação', 'Produtora', 'Redes Sociais', 'Material Gráfico',
+  'Outdoors/Busdoor/ Mídia Exterior', 'Mídia Nacional', 'Eventos Especiais'
+].map(name => ({ name, key: name.toLowerCase() }));
+
+/** Casa nome de categoria com a chave de um totalizador (em qualquer direção) */
+const matchesTotalizer = (categoryName: string, key: string) => {
+  const a = categoryName.toLowerCase();
+  return a.includes(key) || key.includes(a);
+};
+
 export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: DashboardViewProps) => {
   const [filters, setFilters] = useState<DashboardFilter>({});
 
-  // Sincroniza com filtros externos
+  // Sincroniza com filtros externos (mantém o estado se nada mudou, evitando re-render)
   useEffect(() => {
     if (externalFilters) {
-      setFilters(prev => ({ ...prev, ...externalFilters }));
+      setFilters(prev => {
+        const changed = (Object.keys(externalFilters) as (keyof typeof externalFilters)[])
+          .some(k => prev[k] !== externalFilters[k]);
+        return changed ? { ...prev, ...externalFilters } : prev;
+      });
     }
   }, [externalFilters]);
 
@@ -77,52 +105,52 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
     return categoriesToUse.map(cat => ({ id: cat.id, name: cat.name }));
   }, [categoriesToUse]);
 
+  /** Categoria selecionada (bloco de detalhes) */
+  const selectedCat = useMemo(
+    () => (filters.category ? categoriesToUse.find(c => c.id === filters.category) : undefined),
+    [categoriesToUse, filters.category]
+  );
+
   /** Dados do dashboard (kpis + datasets) */
   const dashboardData = useMemo(() => {
     if (!selectedSheet) return null;
 
-    // Filtra categoria (se selecionada)
-    const filtered = categoriesToUse.filter(cat => {
-      if (filters.category && cat.id !== filters.category) return false;
-      return true;
-    });
+    // Filtra categoria (se selecionada); sem filtro, reaproveita o array da aba
+    const filtered = filters.category
+      ? categoriesToUse.filter(cat => cat.id === filters.category)
+      : categoriesToUse;
 
     // Orçamento total: prioriza linha TOTAL; senão soma das categorias da planilha completa
     const totalBudget = (() => {
-      const totalCat = selectedSheet.categories?.find(cat =>
-        ['total', 'TOTAL'].includes(cat.id) ||
-        cat.name?.trim().toUpperCase() === 'TOTAL' ||
-        cat.name?.toLowerCase().includes('total')
-      );
+      const totalCat = selectedSheet.categories?.find(cat => cat.id === 'total' || cat.id === 'TOTAL' || isTotalName(cat.name));
       const byTotalRow = totalCat?.globalValue ?? 0;
       if (byTotalRow > 0) return byTotalRow;
 
       const sumSheet = (selectedSheet.categories || [])
-        .filter(c => !(c.name || '').toLowerCase().includes('total'))
-        .reduce((acc, c) => acc + (c.globalValue || 0), 0);
+        .reduce((acc, c) => (isTotalName(c.name) ? acc : acc + (c.globalValue || 0)), 0);
       return sumSheet;
     })();
 
-    const totalCommitted = filtered.reduce((acc, c) => acc + (c.committed || 0), 0);
-    const totalBalance   = filtered.reduce((acc, c) => acc + (c.balance   || 0), 0);
-
-    // Dataset por categoria (gráficos)
-    const categoryData = filtered.map(cat => ({
-      name: cat.name,
-      orcamento: cat.globalValue || 0,
-      empenhado: cat.committed   || 0,
-      saldo: cat.balance         || 0,
-      percentual: pct(cat.committed || 0, cat.globalValue || 0)
-    }));
+    // Totais e dataset por categoria (gráficos) numa única passada
+    let totalCommitted = 0;
+    let totalBalance = 0;
+    const categoryData = filtered.map(cat => {
+      const orcamento = cat.globalValue || 0;
+      const empenhado = cat.committed   || 0;
+      const saldo     = cat.balance     || 0;
+      totalCommitted += empenhado;
+      totalBalance   += saldo;
+      return { name: cat.name, orcamento, empenhado, saldo, percentual: pct(empenhado, orcamento) };
+    });
 
     // “Status” estimado sem aleatoriedade:
     // Para cada categoria, distribui proporcionalmente o valor empenhado entre as campanhas do veículo.
     // Campanha é considerada “empenhada” se a parcela estimada cobrir o valor daquela campanha.
-    type StatusRow = { category: string; vehicle: string; campaign: string; value: number; status: 'empenhado' | 'pendente' };
-    const statusRows: StatusRow[] = [];
+    // Só as contagens são consumidas: acumula direto, sem materializar uma linha por campanha.
+    let pendingPayments = 0;
+    let completedCampaigns = 0;
 
     filtered.forEach(cat => {
-      const catTotalCampaigns = cat.vehicles?.reduce((acc, v) => acc + Object.values(v.campaigns || {}).length, 0) || 0;
       const catBudget = cat.globalValue || 0;
       const catCommitted = Math.min(cat.committed || 0, catBudget);
       const committedRatio = pct(catCommitted, catBudget) / 100; // 0..1
@@ -136,35 +164,35 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
 
         // percorre campanhas acumulando
         let remaining = vehicleCommittedEst;
-        campaignEntries.forEach(([campaign, value]) => {
+        campaignEntries.forEach(([, value]) => {
           const v = Number(value) || 0;
-          const isEmp = remaining >= v - 1e-6;
-          statusRows.push({
-            category: cat.name,
-            vehicle: vehicle.name,
-            campaign,
-            value: v,
-            status: isEmp ? 'empenhado' : 'pendente'
-          });
+          if (remaining >= v - 1e-6) completedCampaigns++;
+          else pendingPayments++;
           remaining = Math.max(0, remaining - v);
         });
       });
     });
 
-    const pendingPayments     = statusRows.filter(s => s.status === 'pendente').length;
-    const completedCampaigns  = statusRows.filter(s => s.status === 'empenhado').length;
-
     return {
       totalBudget,
       totalCommitted,
       totalBalance,
       pendingPayments,
       completedCampaigns,
-      categoryData,
-      statusData: statusRows
+      categoryData
     };
   }, [selectedSheet, categoriesToUse, filters.category]);
 
+  /** Totalizadores por Valor Global: casa cada nome uma única vez por dataset */
+  const totalizers = useMemo(() => {
+    const items = TOTALIZER_NAMES.map(({ name, key }) => ({
+      name,
+      item: dashboardData?.categoryData.find(cat => matchesTotalizer(cat.name, key))
+    }));
+    const sum = items.reduce((acc, { item }) => acc + (item?.orcamento || 0), 0);
+    return { items, sum };
+  }, [dashboardData]);
+
   if (!dashboardData) {
     return (
       <div className="flex items-center justify-center h-64">
@@ -173,6 +201,13 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
     );
   }
 
+  // Categoria de sites muda os rótulos do bloco de detalhes; normaliza o nome uma única vez
+  const isSiteCategory = !!selectedCat?.name.toLowerCase().includes('site');
+
+  // “Status” das campanhas do bloco de detalhes: depende só da categoria, não de cada campanha
+  const selectedCatStatus =
+    selectedCat && pct(selectedCat.committed || 0, selectedCat.globalValue || 0) >= 50 ? 'Empenhado' : 'Pendente';
+
   const onChangeSheet = (value: string) => {
     const nf = { sheet: value, tab: '', category: '' };
     setFilters(nf);
@@ -193,22 +228,6 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
     onFiltersChange?.(nf);
   };
 
-  // Lista fixa de nomes para o bloco “Totalizadores por Valor Global”
-  const TOTALIZER_NAMES = [
-    'OAM', 'TVs', 'Site', 'Rádio', 'Jornais/Revistas',
-    'Criação', 'Produtora', 'Redes Sociais', 'Material Gráfico',
-    'Outdoors/Busdoor/ Mídia Exterior', 'Mídia Nacional', 'Eventos Especiais'
-  ];
-
-  const sumTotalizers = TOTALIZER_NAMES.reduce((sum, categoryName) => {
-    const item = dashboardData.categoryData.find(cat => {
-      const a = cat.name.toLowerCase();
-      const b = categoryName.toLowerCase();
-      return a.includes(b) || b.includes(a) || a === b;
-    });
-    return sum + (item?.orcamento || 0);
-  }, 0);
-
   return (
     <div className="space-y-6">
       {/* Filtros */}
@@ -335,12 +354,7 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
         </CardHeader>
         <CardContent>
           <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4">
-            {TOTALIZER_NAMES.map((name, i) => {
-              const item = dashboardData.categoryData.find(cat => {
-                const a = cat.name.toLowerCase();
-                const b = name.toLowerCase();
-                return a.includes(b) || b.includes(a) || a === b;
-              });
+            {totalizers.items.map(({ name, item }, i) => {
               const value = item?.orcamento || 0;
               return (
                 <div
@@ -360,7 +374,7 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
           <div className="mt-4 p-4 bg-primary/10 rounded-lg">
             <div className="flex justify-between items-center">
               <span className="font-semibold text-lg">TOTAL:</span>
-              <span className="font-bold text-2xl text-primary">{formatCurrency(sumTotalizers)}</span>
+              <span className="font-bold text-2xl text-primary">{formatCurrency(totalizers.sum)}</span>
             </div>
           </div>
         </CardContent>
@@ -377,8 +391,8 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
               <BarChart data={dashboardData.categoryData}>
                 <CartesianGrid strokeDasharray="3 3" />
                 <XAxis dataKey="name" angle={-45} textAnchor="end" height={80} />
-                <YAxis tickFormatter={(v) => `R$ ${(Number(v || 0) / 1_000_000).toFixed(1)}M`} />
-                <Tooltip formatter={(v: number) => formatCurrency(Number(v || 0))} />
+                <YAxis tickFormatter={formatMillions} />
+                <Tooltip formatter={formatTooltipValue} />
                 <Bar dataKey="orcamento" fill="hsl(var(--primary))" name="Orçamento" />
                 <Bar dataKey="empenhado" fill="hsl(var(--success))" name="Empenhado" />
               </BarChart>
@@ -398,7 +412,7 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
                   cx="50%"
                   cy="50%"
                   labelLine={false}
-                  label={({ name, percent }) => `${name}: ${((percent || 0) * 100).toFixed(0)}%`}
+                  label={renderPieLabel}
                   outerRadius={80}
                   dataKey="orcamento"
                 >
@@ -406,7 +420,7 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
                     <Cell key={idx} fill={COLORS[idx % COLORS.length]} />
                   ))}
                 </Pie>
-                <Tooltip formatter={(v: number) => formatCurrency(Number(v || 0))} />
+                <Tooltip formatter={formatTooltipValue} />
               </PieChart>
             </ResponsiveContainer>
           </CardContent>
@@ -414,124 +428,119 @@ export const DashboardView = ({ sheets, externalFilters, onFiltersChange }: Dash
       </div>
 
       {/* Detalhes da Categoria Selecionada */}
-      {filters.category && (() => {
-        const selectedCat = categoriesToUse.find(c => c.id === filters.category);
-        if (!selectedCat) return null;
-
-        return (
-          <Card>
-            <CardHeader>
-              <CardTitle>Detalhes da Categoria: {selectedCat.name}</CardTitle>
-            </CardHeader>
-            <CardContent>
-              <div className="space-y-4">
-                <div className="grid gap-4 md:grid-cols-3">
-                  <div className="text-center p-4 bg-muted/50 rounded-lg">
-                    <div className="text-2xl font-bold text-primary">{formatCurrency(selectedCat.globalValue || 0)}</div>
-                    <p className="text-sm text-muted-foreground">Orçamento Global</p>
-                  </div>
-                  <div className="text-center p-4 bg-muted/50 rounded-lg">
-                    <div className="text-2xl font-bold text-success">{formatCurrency(selectedCat.committed || 0)}</div>
-                    <p className="text-sm text-muted-foreground">Valor Empenhado</p>
-                  </div>
-                  <div className="text-center p-4 bg-muted/50 rounded-lg">
-                    <div className="text-2xl font-bold text-warning">{formatCurrency(selectedCat.balance || 0)}</div>
-                    <p className="text-sm text-muted-foreground">Saldo Disponível</p>
-                  </div>
+      {selectedCat && (
+        <Card>
+          <CardHeader>
+            <CardTitle>Detalhes da Categoria: {selectedCat.name}</CardTitle>
+          </CardHeader>
+          <CardContent>
+            <div className="space-y-4">
+              <div className="grid gap-4 md:grid-cols-3">
+                <div className="text-center p-4 bg-muted/50 rounded-lg">
+                  <div className="text-2xl font-bold text-primary">{formatCurrency(selectedCat.globalValue || 0)}</div>
+                  <p className="text-sm text-muted-foreground">Orçamento Global</p>
+                </div>
+                <div className="text-center p-4 bg-muted/50 rounded-lg">
+                  <div className="text-2xl font-bold text-success">{formatCurrency(selectedCat.committed || 0)}</div>
+                  <p className="text-sm text-muted-foreground">Valor Empenhado</p>
+                </div>
+                <div className="text-center p-4 bg-muted/50 rounded-lg">
+                  <div className="text-2xl font-bold text-warning">{formatCurrency(selectedCat.balance || 0)}</div>
+                  <p className="text-sm text-muted-foreground">Saldo Disponível</p>
                 </div>
+              </div>
 
-                <div className="space-y-4">
-                  <h3 className="text-lg font-semibold">
-                    {selectedCat.name.toLowerCase().includes('site') ? 'Sites da Categoria' : 'Veículos da Categoria'}
-                  </h3>
-
-                  {(selectedCat.vehicles || []).map((vehicle) => {
-                    const totalBudget = Number(vehicle.totalBudget || 0);
-                    const totalUsed   = Number(vehicle.totalUsed || 0);
-                    const balance     = Number(vehicle.balance || Math.max(0, totalBudget - totalUsed));
-                    const usedPct     = pct(totalUsed, totalBudget);
-
-                    return (
-                      <Card key={vehicle.id} className="border-l-4 border-l-primary">
-                        <CardContent className="p-4">
-                          <div className="flex justify-between items-start mb-3">
-                            <h4 className="font-semibold text-lg">
-                              {selectedCat.name.toLowerCase().includes('site') ? `Site: ${vehicle.name}` : vehicle.name}
-                            </h4>
-                            <Badge variant={balance > 0 ? 'default' : 'destructive'}>
-                              Saldo: {formatCurrency(balance)}
-                            </Badge>
+              <div className="space-y-4">
+                <h3 className="text-lg font-semibold">
+                  {isSiteCategory ? 'Sites da Categoria' : 'Veículos da Categoria'}
+                </h3>
+
+                {(selectedCat.vehicles || []).map((vehicle) => {
+                  const totalBudget = Number(vehicle.totalBudget || 0);
+                  const totalUsed   = Number(vehicle.totalUsed || 0);
+                  const balance     = Number(vehicle.balance || Math.max(0, totalBudget - totalUsed));
+                  const usedPct     = pct(totalUsed, totalBudget);
+
+                  return (
+                    <Card key={vehicle.id} className="border-l-4 border-l-primary">
+                      <CardContent className="p-4">
+                        <div className="flex justify-between items-start mb-3">
+                          <h4 className="font-semibold text-lg">
+                            {isSiteCategory ? `Site: ${vehicle.name}` : vehicle.name}
+                          </h4>
+                          <Badge variant={balance > 0 ? 'default' : 'destructive'}>
+                            Saldo: {formatCurrency(balance)}
+                          </Badge>
+                        </div>
+
+                        <div className="grid gap-2 md:grid-cols-3 mb-4">
+                          <div>
+                            <span className="text-sm text-muted-foreground">
+                              {isSiteCategory ? 'Orçamento do Site:' : 'Orçamento Total:'}
+                            </span>
+                            <div className="font-medium">{formatCurrency(totalBudget)}</div>
                           </div>
-
-                          <div className="grid gap-2 md:grid-cols-3 mb-4">
-                            <div>
-                              <span className="text-sm text-muted-foreground">
-                                {selectedCat.name.toLowerCase().includes('site') ? 'Orçamento do Site:' : 'Orçamento Total:'}
-                              </span>
-                              <div className="font-medium">{formatCurrency(totalBudget)}</div>
-                            </div>
-                            <div>
-                              <span className="text-sm text-muted-foreground">
-                                {selectedCat.name.toLowerCase().includes('site') ? 'Valor Investido:' : 'Total Usado:'}
-                              </span>
-                              <div className="font-medium">{formatCurrency(totalUsed)}</div>
-                            </div>
-                            <div>
-                              <span className="text-sm text-muted-foreground">% Utilizado:</span>
-                              <div className="font-medium">{usedPct.toFixed(1)}%</div>
-                            </div>
+                          <div>
+                            <span className="text-sm text-muted-foreground">
+                              {isSiteCategory ? 'Valor Investido:' : 'Total Usado:'}
+                            </span>
+                            <div className="font-medium">{formatCurrency(totalUsed)}</div>
                           </div>
-
-                          {vehicle.observations && (
-                            <div className="mb-4 p-3 bg-muted/30 rounded-lg">
-                              <span className="text-sm text-muted-foreground">Observações:</span>
-                              <p className="text-sm mt-1">{vehicle.observations}</p>
-                            </div>
-                          )}
-
                           <div>
-                            <h5 className="font-medium mb-2">
-                              {selectedCat.name.toLowerCase().includes('site') ? 'Investimentos por Período:' : 'Campanhas:'}
-                            </h5>
-                            <div className="space-y-2">
-                              {Object.entries(vehicle.campaigns || {}).map(([campaign, value]) => (
-                                <div key={campaign} className="flex justify-between items-center p-3 bg-muted/20 rounded-lg">
-                                  <div className="flex flex-col">
-                                    <span className="text-sm font-medium">{campaign}</span>
-                                    {selectedCat.name.toLowerCase().includes('site') && (
-                                      <span className="text-xs text-muted-foreground">Período de investimento</span>
-                                    )}
-                                  </div>
-                                  <div className="flex items-center gap-2">
-                                    <span className="font-bold text-lg">{formatCurrency(Number(value) || 0)}</span>
-                                    {/* “Status” aproximado com base no comprometido da categoria */}
-                                    <Badge variant="secondary">
-                                      {pct((selectedCat.committed || 0), (selectedCat.globalValue || 0)) >= 50 ? 'Empenhado' : 'Pendente'}
-                                    </Badge>
-                                  </div>
-                                </div>
-                              ))}
-                            </div>
+                            <span className="text-sm text-muted-foreground">% Utilizado:</span>
+                            <div className="font-medium">{usedPct.toFixed(1)}%</div>
+                          </div>
+                        </div>
 
-                            {selectedCat.name.toLowerCase().includes('site') && (
-                              <div className="mt-4 p-3 bg-primary/10 rounded-lg">
-                                <div className="flex justify-between items-center">
-                                  <span className="font-medium">Total investido neste site:</span>
-                                  <span className="font-bold text-xl text-primary">{formatCurrency(totalUsed)}</span>
+                        {vehicle.observations && (
+                          <div className="mb-4 p-3 bg-muted/30 rounded-lg">
+                            <span className="text-sm text-muted-foreground">Observações:</span>
+                            <p className="text-sm mt-1">{vehicle.observations}</p>
+                          </div>
+                        )}
+
+                        <div>
+                          <h5 className="font-medium mb-2">
+                            {isSiteCategory ? 'Investimentos por Período:' : 'Campanhas:'}
+                          </h5>
+                          <div className="space-y-2">
+                            {Object.entries(vehicle.campaigns || {}).map(([campaign, value]) => (
+                              <div key={campaign} className="flex justify-between items-center p-3 bg-muted/20 rounded-lg">
+                                <div className="flex flex-col">
+                                  <span className="text-sm font-medium">{campaign}</span>
+                                  {isSiteCategory && (
+                                    <span className="text-xs text-muted-foreground">Período de investimento</span>
+                                  )}
+                                </div>
+                                <div className="flex items-center gap-2">
+                                  <span className="font-bold text-lg">{formatCurrency(Number(value) || 0)}</span>
+                                  {/* “Status” aproximado com base no comprometido da categoria */}
+                                  <Badge variant="secondary">
+                                    {selectedCatStatus}
+                                  </Badge>
                                 </div>
                               </div>
-                            )}
+                            ))}
                           </div>
-                        </CardContent>
-                      </Card>
-                    );
-                  })}
-                </div>
+
+                          {isSiteCategory && (
+                            <div className="mt-4 p-3 bg-primary/10 rounded-lg">
+                              <div className="flex justify-between items-center">
+                                <span className="font-medium">Total investido neste site:</span>
+                                <span className="font-bold text-xl text-primary">{formatCurrency(totalUsed)}</span>
+                              </div>
+                            </div>
+                          )}
+                        </div>
+                      </CardContent>
+                    </Card>
+                  );
+                })}
               </div>
-            </CardContent>
-          </Card>
-        );
-      })()}
+            </div>
+          </CardContent>
+        </Card>
+      )}
     </div>
   );
 };